@@ -17,9 +17,7 @@ Remove:   python3 confessional_hook.py --uninstall
 import sys
 import json
 import os
-import logging
 import subprocess
-from datetime import datetime, timezone
 from pathlib import Path
 
 LOG_PATH = Path.home() / ".reflection" / "hook.log"
@@ -32,6 +30,8 @@ import confessional_store as store
 
 
 def get_logger():
+    # logging is only needed on the error path, so import it here
+    import logging
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger("confessional")
     if not logger.handlers:
@@ -64,6 +64,7 @@ def handle_session_start(input_data):
     if not store.is_recording(project):
         return
 
+    from datetime import datetime, timezone
     try:
         bp = store.get_current_breakpoint(project)
         if bp:
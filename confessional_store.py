@@ -16,8 +16,7 @@ Storage layout:
 import json
 import os
 import sys
-import tempfile
-from datetime import datetime, timezone
+import time
 from pathlib import Path
 
 STORE_DIR = Path(os.environ.get("CONFESSIONAL_STORE_DIR", str(Path.home() / ".reflection")))
@@ -25,7 +24,9 @@ CONFIG_PATH = STORE_DIR / "config.json"
 
 
 def _now_iso():
-    return datetime.now(timezone.utc).isoformat()
+    """UTC timestamp in datetime.isoformat() form, built without importing datetime."""
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)) + f".{ns // 1000:06d}+00:00"
 
 
 def _project_dir(project):
@@ -37,43 +38,101 @@ def _project_dir(project):
 
 def _read_jsonl(path):
     """Read all entries from a JSONL file. Returns empty list if missing."""
-    path = Path(path)
-    if not path.exists():
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
         return []
+    with f:
+        data = f.read()
     entries = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
+    # split("\n"), not splitlines(): U+2028 may appear unescaped inside values
+    for line in data.split("\n"):
+        line = line.strip()
+        if line:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def _tail_jsonl(path, n):
+    """Read the last n valid entries of a JSONL file, parsing only its tail.
+
+    Reads backwards in growing chunks until n entries are found or the whole
+    file has been read. Blank and corrupt lines are skipped as in _read_jsonl.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        chunk = 4096
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            lines = f.read(size - start).split(b"\n")
+            if start > 0:
+                lines = lines[1:]  # may be cut mid-line
+            entries = []
+            for line in reversed(lines):
+                line = line.strip()
+                if not line:
+                    continue
                 try:
                     entries.append(json.loads(line))
-                except json.JSONDecodeError:
+                except ValueError:
                     continue
-    return entries
+                if len(entries) == n:
+                    break
+            if len(entries) == n or start == 0:
+                entries.reverse()
+                return entries
+            chunk *= 4
 
 
 def _append_jsonl(path, entry):
     """Append a single JSON entry to a JSONL file. Creates dirs if needed."""
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+    line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+    data = line.encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    # Only touch the directory tree when the first open fails
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(os.fspath(path)), exist_ok=True)
+        fd = os.open(path, flags, 0o666)
+    try:
+        # Unbuffered O_APPEND write: large entries aren't split across
+        # several write() calls that could interleave with another appender
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 # --- Config I/O ---
 
 def _read_config():
     """Read config.json. Returns empty dict if missing."""
-    if not CONFIG_PATH.exists():
+    try:
+        f = open(CONFIG_PATH, "r", encoding="utf-8")
+    except FileNotFoundError:
         return {}
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+    with f:
         return json.load(f)
 
 
 def _write_config(config):
     """Write config.json atomically (write to tmp, then rename)."""
-    STORE_DIR.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(dir=str(STORE_DIR), suffix=".json")
+    import tempfile
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=str(STORE_DIR), suffix=".json")
+    except FileNotFoundError:
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(STORE_DIR), suffix=".json")
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=2)
@@ -102,16 +161,24 @@ def add_breakpoint(project, note=""):
 
 def get_current_breakpoint(project):
     """Get the most recent breakpoint (last entry). Returns None if empty."""
-    entries = _read_jsonl(_project_dir(project) / "breakpoints.jsonl")
+    entries = _tail_jsonl(_project_dir(project) / "breakpoints.jsonl", 1)
     return entries[-1] if entries else None
 
 
 def get_previous_breakpoint(project):
     """Get the second most recent breakpoint. Returns None if < 2 entries."""
-    entries = _read_jsonl(_project_dir(project) / "breakpoints.jsonl")
+    entries = _tail_jsonl(_project_dir(project) / "breakpoints.jsonl", 2)
     return entries[-2] if len(entries) >= 2 else None
 
 
+def get_last_two_breakpoints(project):
+    """Get (current, previous) breakpoints from a single read. Missing ones are None."""
+    entries = _tail_jsonl(_project_dir(project) / "breakpoints.jsonl", 2)
+    current = entries[-1] if entries else None
+    previous = entries[-2] if len(entries) >= 2 else None
+    return current, previous
+
+
 def get_all_breakpoints(project):
     """Get all breakpoints for a project."""
     return _read_jsonl(_project_dir(project) / "breakpoints.jsonl")
@@ -135,8 +202,7 @@ def store_reflection(project, reflection_text, git_summary="", prompt_count=0,
     existing = _read_jsonl(ref_path)
     new_id = len(existing) + 1
 
-    current_bp = get_current_breakpoint(project)
-    previous_bp = get_previous_breakpoint(project)
+    current_bp, previous_bp = get_last_two_breakpoints(project)
 
     entry = {
         "id": new_id,
@@ -168,9 +234,13 @@ def _normalize_loop(entry):
     return {"loop": str(entry), "task_type": "unknown"}
 
 
-def get_all_loops(project):
-    """Get all methodology loops across reflections, with metadata."""
-    reflections = get_reflections(project)
+def get_all_loops(project, reflections=None):
+    """Get all methodology loops across reflections, with metadata.
+
+    Pass reflections if the caller already has get_reflections(project).
+    """
+    if reflections is None:
+        reflections = get_reflections(project)
     loops = []
     for ref in reflections:
         for raw in ref.get("loops", []):
@@ -285,6 +355,63 @@ def is_recording(project):
 
 # --- CLI ---
 
+def _cli_init(project, _arg, _stdin_text, _loops):
+    # Ensure project dir exists, create initial breakpoint if needed
+    if not get_current_breakpoint(project):
+        add_breakpoint(project, "Initial breakpoint")
+    enable_recording(project)
+    return {"project": project, "initialized": True}
+
+
+def _cli_get_breakpoint_by_id(project, arg, _stdin_text, _loops):
+    bp_id = int(arg(3, "0"))
+    return (get_breakpoint_by_id(project, bp_id)
+            or {"error": f"No breakpoint with id {bp_id}."})
+
+
+def _cli_store_reflection(project, arg, stdin_text, loops):
+    if stdin_text is not None:
+        ref = store_reflection(project, stdin_text, arg(3, ""), int(arg(4, "0")),
+                               loops=loops)
+    else:
+        ref = store_reflection(project, arg(3), arg(4, ""), int(arg(5, "0")),
+                               loops=loops)
+    return {"id": ref["id"], "stored": True}
+
+
+def _cli_set_recording(enabled):
+    def handler(project, _arg, _stdin_text, _loops):
+        (enable_recording if enabled else disable_recording)(project)
+        return {"project": project, "recording": enabled}
+    return handler
+
+
+# command -> handler(project, arg, stdin_text, loops). List results are
+# streamed with indent=2, everything else is printed on a single line.
+COMMANDS = {
+    "init": _cli_init,
+    "breakpoint": lambda p, arg, *_: add_breakpoint(p, arg(3, "")),
+    "get_current_breakpoint": lambda p, *_: (
+        get_current_breakpoint(p) or {"error": "No breakpoints found."}),
+    "get_previous_breakpoint": lambda p, *_: (
+        get_previous_breakpoint(p) or {"error": "No previous breakpoint."}),
+    "get_all_breakpoints": lambda p, *_: get_all_breakpoints(p),
+    "get_breakpoint_by_id": _cli_get_breakpoint_by_id,
+    "store_reflection": _cli_store_reflection,
+    "get_reflections": lambda p, *_: get_reflections(p),
+    "get_reflections_summary": lambda p, *_: get_reflections_summary(p),
+    "enable_recording": _cli_set_recording(True),
+    "disable_recording": _cli_set_recording(False),
+    "is_recording": lambda p, *_: {"project": p, "recording": is_recording(p)},
+    "append_dashboard_manifest": lambda p, arg, *_: append_dashboard_manifest(
+        p, int(arg(3)), int(arg(4)), arg(5)),
+    "get_all_loops": lambda p, *_: get_all_loops(p),
+    "step_frequencies": lambda p, *_: get_step_frequencies(p),
+    "core_loop": lambda p, *_: get_core_loop(p) or {"error": "No loops found."},
+    "get_dashboard_manifest": lambda p, *_: get_dashboard_manifest(p),
+}
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: confessional_store.py <command> <project> [args...] [--stdin]")
@@ -315,104 +442,23 @@ def main():
     command = argv[1]
     project = argv[2]
 
+    handler = COMMANDS.get(command)
+    if handler is None:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
     def arg(index, default=""):
         return argv[index] if len(argv) > index else default
 
     stdin_text = sys.stdin.read() if use_stdin else None
 
-    if command == "init":
-        # Ensure project dir exists, create initial breakpoint if needed
-        if not get_current_breakpoint(project):
-            add_breakpoint(project, "Initial breakpoint")
-        enable_recording(project)
-        print(json.dumps({"project": project, "initialized": True}))
-
-    elif command == "breakpoint":
-        bp = add_breakpoint(project, arg(3, ""))
-        print(json.dumps(bp))
-
-    elif command == "get_current_breakpoint":
-        bp = get_current_breakpoint(project)
-        if bp:
-            print(json.dumps(bp))
-        else:
-            print(json.dumps({"error": "No breakpoints found."}))
-
-    elif command == "get_previous_breakpoint":
-        bp = get_previous_breakpoint(project)
-        if bp:
-            print(json.dumps(bp))
-        else:
-            print(json.dumps({"error": "No previous breakpoint."}))
-
-    elif command == "get_all_breakpoints":
-        bps = get_all_breakpoints(project)
-        print(json.dumps(bps, indent=2))
-
-    elif command == "get_breakpoint_by_id":
-        bp_id = int(arg(3, "0"))
-        bp = get_breakpoint_by_id(project, bp_id)
-        if bp:
-            print(json.dumps(bp))
-        else:
-            print(json.dumps({"error": f"No breakpoint with id {bp_id}."}))
-
-    elif command == "store_reflection":
-        if use_stdin:
-            ref = store_reflection(project, stdin_text, arg(3, ""), int(arg(4, "0")),
-                                   loops=loops_value)
-        else:
-            ref = store_reflection(project, arg(3), arg(4, ""), int(arg(5, "0")),
-                                   loops=loops_value)
-        print(json.dumps({"id": ref["id"], "stored": True}))
-
-    elif command == "get_reflections":
-        refs = get_reflections(project)
-        print(json.dumps(refs, indent=2))
-
-    elif command == "get_reflections_summary":
-        summary = get_reflections_summary(project)
-        print(json.dumps(summary, indent=2))
-
-    elif command == "enable_recording":
-        enable_recording(project)
-        print(json.dumps({"project": project, "recording": True}))
-
-    elif command == "disable_recording":
-        disable_recording(project)
-        print(json.dumps({"project": project, "recording": False}))
-
-    elif command == "is_recording":
-        enabled = is_recording(project)
-        print(json.dumps({"project": project, "recording": enabled}))
-
-    elif command == "append_dashboard_manifest":
-        entry = append_dashboard_manifest(
-            project, int(arg(3)), int(arg(4)), arg(5))
-        print(json.dumps(entry))
-
-    elif command == "get_all_loops":
-        loops = get_all_loops(project)
-        print(json.dumps(loops, indent=2))
-
-    elif command == "step_frequencies":
-        freqs = get_step_frequencies(project)
-        print(json.dumps(freqs, indent=2))
-
-    elif command == "core_loop":
-        result = get_core_loop(project)
-        if result:
-            print(json.dumps(result))
-        else:
-            print(json.dumps({"error": "No loops found."}))
-
-    elif command == "get_dashboard_manifest":
-        manifest = get_dashboard_manifest(project)
-        print(json.dumps(manifest, indent=2))
-
+    result = handler(project, arg, stdin_text, loops_value)
+    if isinstance(result, list):
+        # Stream list output so large reflection dumps aren't built as one string
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
-        print(f"Unknown command: {command}")
-        sys.exit(1)
+        print(json.dumps(result))
 
 
 if __name__ == "__main__":
@@ -114,6 +114,8 @@ TASK_TYPE_COLORS = {
     "unknown": "var(--text-muted)",
 }
 
+AGENCY_LABELS = {"i": "I", "we": "We", "you": "You", "lets": "Let's", "none": "None"}
+
 
 def _theme_css_vars(theme_name=None):
     """Generate :root CSS variables for a theme."""
@@ -197,6 +199,10 @@ def _theme_selector_html():
 </script>"""
 
 
+# Theme selector markup is identical on every page, so render it once
+THEME_SELECTOR_HTML = _theme_selector_html()
+
+
 CSS_STYLES = """
 """ + _theme_css_vars(DEFAULT_THEME) + """
 
@@ -427,17 +433,21 @@ def _format_value(value):
     return str(value)
 
 
+def _plural(count, singular, plural):
+    """Format a count with the singular or plural noun, e.g. '1 loop', '3 loops'."""
+    return f'{count} {singular if count == 1 else plural}'
+
+
 def _bar_chart_html(items):
     """Render a horizontal bar chart. items: list of (label, value) tuples."""
     if not items:
         return '<div class="bar-chart"><span class="no-data">No data</span></div>'
-    max_val = max(v for _, v in items) if items else 1
-    if max_val == 0:
-        max_val = 1
+    max_val = max(v for _, v in items) or 1
+    scale = 100 / max_val
     colors = ["", "c2", "c3", "c4", "c5"]
     rows = []
     for i, (label, value) in enumerate(items):
-        pct = round((value / max_val) * 100)
+        pct = round(value * scale)
         color_class = colors[i % len(colors)]
         display_val = _format_value(value)
         rows.append(
@@ -502,6 +512,13 @@ def _section_html(title, content):
     return f'<h2>{html.escape(title)}</h2>\n{content}'
 
 
+# Markdown patterns, compiled once at import
+BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
+CODE_SPAN_PATTERN = re.compile(r'`([^`]+)`')
+STRONG_SPLIT_PATTERN = re.compile(r'(<strong>.*?</strong>)')
+INLINE_TAG_SPLIT_PATTERN = re.compile(r'(<(?:strong|code)>.*?</(?:strong|code)>)')
+
+
 def _markdown_to_html(text):
     """Convert basic markdown to HTML. Handles headers, bold, lists, paragraphs."""
     lines = text.split('\n')
@@ -522,12 +539,11 @@ def _markdown_to_html(text):
         elif stripped.startswith('## '):
             header_text = stripped[3:]
             # Handle bold in headers: ## N. **Title**
-            header_text = re.sub(
-                r'\*\*(.+?)\*\*',
+            header_text = BOLD_PATTERN.sub(
                 lambda m: f'<strong>{html.escape(m.group(1))}</strong>',
                 header_text)
             # Escape parts outside of tags
-            parts = re.split(r'(<strong>.*?</strong>)', header_text)
+            parts = STRONG_SPLIT_PATTERN.split(header_text)
             escaped = ''.join(
                 p if p.startswith('<strong>') else html.escape(p)
                 for p in parts)
@@ -557,13 +573,13 @@ def _markdown_to_html(text):
 def _inline_markdown(text):
     """Convert inline markdown (bold, code) to HTML."""
     # Code spans first (so bold inside code isn't processed)
-    text = re.sub(r'`([^`]+)`',
-                  lambda m: f'<code>{html.escape(m.group(1))}</code>', text)
+    text = CODE_SPAN_PATTERN.sub(
+        lambda m: f'<code>{html.escape(m.group(1))}</code>', text)
     # Bold
-    text = re.sub(r'\*\*(.+?)\*\*',
-                  lambda m: f'<strong>{html.escape(m.group(1))}</strong>', text)
+    text = BOLD_PATTERN.sub(
+        lambda m: f'<strong>{html.escape(m.group(1))}</strong>', text)
     # Escape remaining text that isn't already in tags
-    parts = re.split(r'(<(?:strong|code)>.*?</(?:strong|code)>)', text)
+    parts = INLINE_TAG_SPLIT_PATTERN.split(text)
     result = ''.join(
         p if p.startswith(('<strong>', '<code>')) else html.escape(p)
         for p in parts)
@@ -584,7 +600,7 @@ def _normalize_loop(entry):
     return {"loop": str(entry), "task_type": "unknown"}
 
 
-def _task_type_badge_html(task_type):
+def _render_task_type_badge(task_type):
     """Render a small colored pill for a task type."""
     color = TASK_TYPE_COLORS.get(task_type.lower(), "var(--text-muted)")
     return (
@@ -595,6 +611,16 @@ def _task_type_badge_html(task_type):
     )
 
 
+# Badges for the known task types; the output only depends on the lowercased name.
+TASK_TYPE_BADGES = {t: _render_task_type_badge(t) for t in TASK_TYPE_COLORS}
+
+
+def _task_type_badge_html(task_type):
+    """Return the task type pill, prerendered for known types."""
+    badge = TASK_TYPE_BADGES.get(task_type.lower())
+    return badge if badge is not None else _render_task_type_badge(task_type)
+
+
 def _step_frequency_chart(loops):
     """Parse loops into individual steps and render a bar chart.
 
@@ -602,13 +628,8 @@ def _step_frequency_chart(loops):
         loops: list of raw loop entries (strings or dicts)
     """
     from collections import Counter
-    counter = Counter()
-    for raw in loops:
-        norm = _normalize_loop(raw)
-        steps = [s.strip() for s in norm["loop"].split("→")]
-        for step in steps:
-            if step:
-                counter[step] += 1
+    steps = (s.strip() for raw in loops for s in _normalize_loop(raw)["loop"].split("→"))
+    counter = Counter(step for step in steps if step)
     if not counter:
         return '<div class="bar-chart"><span class="no-data">No loops recorded</span></div>'
     items = counter.most_common()
@@ -624,12 +645,8 @@ def _core_loop_html(loops):
     from collections import Counter
     if not loops:
         return '<div class="subtitle">No loops recorded yet</div>'
-    loop_texts = []
-    for entry in loops:
-        norm = _normalize_loop(entry)
-        loop_texts.append(norm["loop"])
-    counter = Counter(loop_texts)
-    total = len(loop_texts)
+    counter = Counter(_normalize_loop(entry)["loop"] for entry in loops)
+    total = len(loops)
     top = counter.most_common(3)
 
     parts = []
@@ -639,7 +656,7 @@ def _core_loop_html(loops):
             f'<div class="core-loop">'
             f'<div class="core-loop-text">{html.escape(loop_text)}</div>'
             f'<div class="core-loop-meta">'
-            f'Appeared {count} of {total} time{"s" if total != 1 else ""} ({pct}%)'
+            f'Appeared {count} of {_plural(total, "time", "times")} ({pct}%)'
             f'</div>'
             f'</div>'
         )
@@ -723,7 +740,7 @@ def generate_reflection_html(analysis_data, reflection, project):
     parts = []
 
     # Header with theme selector
-    selector = _theme_selector_html()
+    selector = THEME_SELECTOR_HTML
     parts.append(
         f'<div class="page-header">'
         f'<h1>{html.escape(project)}</h1>'
@@ -833,8 +850,7 @@ def generate_reflection_html(analysis_data, reflection, project):
     ]
     voice_parts.append(_bar_chart_html(agency_items))
     dominant_key = agency.get("dominant", "none")
-    dominant_labels = {"i": "I", "we": "We", "you": "You", "lets": "Let's", "none": "None"}
-    dominant_label = dominant_labels.get(dominant_key, dominant_key)
+    dominant_label = AGENCY_LABELS.get(dominant_key, dominant_key)
     voice_parts.append(
         f'<div class="subtitle">Dominant: <strong>{html.escape(dominant_label)}</strong></div>')
 
@@ -877,11 +893,11 @@ def generate_reflection_html(analysis_data, reflection, project):
 
     # Tool scatter (use progress bars since these are 0.0-1.0 ratios)
     scatter = effectiveness.get("tool_scatter", {})
-    scatter_html = '<div class="subtitle">Higher = more scattered file access</div>'
+    scatter_parts = ['<div class="subtitle">Higher = more scattered file access</div>']
     for style_label, style_key in [("Question", "question"), ("Imperative", "imperative"),
                                     ("Statement", "statement"), ("Overall", "overall")]:
-        scatter_html += _progress_bar_html(scatter.get(style_key, 0), style_label)
-    parts.append(_section_html("Tool Scatter", scatter_html))
+        scatter_parts.append(_progress_bar_html(scatter.get(style_key, 0), style_label))
+    parts.append(_section_html("Tool Scatter", "".join(scatter_parts)))
 
     # N-grams
     ngrams = linguistics.get("frequent_ngrams", {})
@@ -946,18 +962,17 @@ def generate_index_html(reflections, manifest, project, loops=None):
     for entry in manifest:
         dashboard_paths[entry.get("reflection_id")] = entry["html_path"]
 
-    ref_count = len(reflections)
-    ref_word = "reflection" if ref_count == 1 else "reflections"
+    ref_count = _plural(len(reflections), "reflection", "reflections")
 
     parts = []
-    selector = _theme_selector_html()
+    selector = THEME_SELECTOR_HTML
     parts.append(
         f'<div class="page-header">'
         f'<h1>{html.escape(project)}</h1>'
         f'{selector}'
         f'</div>'
     )
-    parts.append(f'<div class="subtitle">{ref_count} {ref_word}</div>')
+    parts.append(f'<div class="subtitle">{ref_count}</div>')
 
     # Methodology Loops section — cards link to reflection pages
     if loops:
@@ -992,9 +1007,8 @@ def generate_index_html(reflections, manifest, project, loops=None):
         parts.append(_section_html("Core Loop", _core_loop_html(loops)))
 
         # Step Frequency Fingerprint
-        all_raw_loops = [entry for entry in loops]
         parts.append(_section_html(
-            "Step Frequency Fingerprint", _step_frequency_chart(all_raw_loops)))
+            "Step Frequency Fingerprint", _step_frequency_chart(loops)))
 
         # Loop Evolution
         parts.append(_section_html(
@@ -1017,15 +1031,13 @@ def generate_index_html(reflections, manifest, project, loops=None):
         else:
             view = '<span class="status-no">&mdash;</span>'
 
-        loops_cell = f'{loop_count} loop{"s" if loop_count != 1 else ""}'
-
         rows.append(
             f'<tr>'
             f'<td>{ref_id}</td>'
             f'<td>{html.escape(date)}</td>'
             f'<td>{html.escape(git_summary)}</td>'
             f'<td>{prompt_count}</td>'
-            f'<td>{loops_cell}</td>'
+            f'<td>{_plural(loop_count, "loop", "loops")}</td>'
             f'<td>{view}</td>'
             f'</tr>'
         )
@@ -1068,11 +1080,11 @@ def _wrap_html(title, body):
 
 def write_reflection_dashboard(project, reflection_id, analysis_data, reflection):
     """Write a reflection dashboard HTML file. Returns the file Path."""
+    content = generate_reflection_html(analysis_data, reflection, project)
     dashboards_dir = store._dashboards_dir(project)
     dashboards_dir.mkdir(parents=True, exist_ok=True)
     path = dashboards_dir / f"reflection-{reflection_id}.html"
-    content = generate_reflection_html(analysis_data, reflection, project)
-    path.write_text(content, encoding="utf-8")
+    path.write_bytes(content.encode("utf-8"))
     return path
 
 
@@ -1090,16 +1102,48 @@ def write_session_dashboard(project, breakpoint_id, analysis_data,
 
 def write_index_dashboard(project, reflections, manifest, loops=None):
     """Write/overwrite the index dashboard HTML file. Returns the file Path."""
+    content = generate_index_html(reflections, manifest, project, loops)
     dashboards_dir = store._dashboards_dir(project)
     dashboards_dir.mkdir(parents=True, exist_ok=True)
     path = dashboards_dir / "index.html"
-    content = generate_index_html(reflections, manifest, project, loops)
-    path.write_text(content, encoding="utf-8")
+    path.write_bytes(content.encode("utf-8"))
     return path
 
 
 # --- CLI ---
 
+def _cli_reflection(project, argv, use_stdin):
+    reflection_id = int(argv[3]) if len(argv) > 3 else 1
+    if use_stdin:
+        if hasattr(sys.stdin, "buffer"):
+            data = json.loads(sys.stdin.buffer.read().decode("utf-8", errors="surrogatepass"))
+        else:
+            data = json.loads(sys.stdin.read())
+    else:
+        print(json.dumps({"error": "reflection command requires --stdin"}))
+        sys.exit(1)
+    analysis = data["analysis"]
+    reflection = data["reflection"]
+    return write_reflection_dashboard(
+        project, reflection_id, analysis, reflection)
+
+
+def _cli_index(project, argv, use_stdin):
+    reflections = store.get_reflections(project)
+    manifest = store.get_dashboard_manifest(project)
+    loops = store.get_all_loops(project, reflections)
+    return write_index_dashboard(
+        project, reflections, manifest, loops)
+
+
+# command -> handler(project, argv, use_stdin) returning the written Path
+COMMANDS = {
+    "reflection": _cli_reflection,
+    "session": _cli_reflection,
+    "index": _cli_index,
+}
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: dashboard_generator.py <command> <project> [args...] [--stdin]")
@@ -1112,34 +1156,14 @@ def main():
     command = argv[1]
     project = argv[2]
 
-    if command in ("reflection", "session"):
-        reflection_id = int(argv[3]) if len(argv) > 3 else 1
-        if use_stdin:
-            if hasattr(sys.stdin, "buffer"):
-                data = json.loads(sys.stdin.buffer.read().decode("utf-8", errors="surrogatepass"))
-            else:
-                data = json.loads(sys.stdin.read())
-        else:
-            print(json.dumps({"error": "reflection command requires --stdin"}))
-            sys.exit(1)
-        analysis = data["analysis"]
-        reflection = data["reflection"]
-        path = write_reflection_dashboard(
-            project, reflection_id, analysis, reflection)
-        print(json.dumps({"path": str(path)}))
-
-    elif command == "index":
-        reflections = store.get_reflections(project)
-        manifest = store.get_dashboard_manifest(project)
-        loops = store.get_all_loops(project)
-        path = write_index_dashboard(
-            project, reflections, manifest, loops)
-        print(json.dumps({"path": str(path)}))
-
-    else:
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
         sys.exit(1)
 
+    path = handler(project, argv, use_stdin)
+    print(json.dumps({"path": str(path)}))
+
 
 if __name__ == "__main__":
     main()
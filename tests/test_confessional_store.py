@@ -9,6 +9,7 @@ Covers:
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -58,6 +59,11 @@ class TestReadJsonl:
         result = store._read_jsonl(path)
         assert len(result) == 2
 
+    def test_line_separator_inside_value(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        store._append_jsonl(path, {"note": "a\u2028b"})
+        assert store._read_jsonl(path) == [{"note": "a\u2028b"}]
+
 
 class TestAppendJsonl:
 
@@ -77,6 +83,13 @@ class TestAppendJsonl:
         assert len(entries) == 3
         assert entries[1] == {"b": 2}
 
+    def test_large_non_ascii_entry_round_trips(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        text = "Réflexion → " * 20000
+        store._append_jsonl(path, {"a": 1})
+        store._append_jsonl(path, {"text": text})
+        assert store._read_jsonl(path) == [{"a": 1}, {"text": text}]
+
     def test_each_entry_on_own_line(self, tmp_path):
         path = tmp_path / "data.jsonl"
         store._append_jsonl(path, {"x": 1})
@@ -84,6 +97,43 @@ class TestAppendJsonl:
         lines = path.read_text().strip().split("\n")
         assert len(lines) == 2
 
+    def test_new_file_mode_follows_umask(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        old = os.umask(0o002)
+        try:
+            store._append_jsonl(path, {"x": 1})
+        finally:
+            os.umask(old)
+        assert path.stat().st_mode & 0o777 == 0o664
+
+
+class TestTailJsonl:
+
+    def test_missing_file(self, tmp_path):
+        assert store._tail_jsonl(tmp_path / "nonexistent.jsonl", 2) == []
+
+    def test_returns_last_entries_in_order(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n{"b": 2}\n{"c": 3}\n')
+        assert store._tail_jsonl(path, 2) == [{"b": 2}, {"c": 3}]
+
+    def test_fewer_entries_than_requested(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n')
+        assert store._tail_jsonl(path, 2) == [{"a": 1}]
+
+    def test_skips_blank_and_corrupt_lines(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"a": 1}\n{"b": 2}\nnot json\n\n')
+        assert store._tail_jsonl(path, 2) == [{"a": 1}, {"b": 2}]
+
+    def test_reads_past_first_chunk(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        entries = [{"i": i, "pad": "x" * 100} for i in range(200)]
+        path.write_text("".join(json.dumps(e) + "\n" for e in entries))
+        path.write_text(path.read_text() + "corrupt\n" * 5000)
+        assert store._tail_jsonl(path, 2) == entries[-2:]
+
 
 # --- Tests: Config I/O ---
 
@@ -99,6 +149,13 @@ class TestConfig:
         result = store._read_config()
         assert result == config
 
+    def test_write_creates_store_dir(self, tmp_path, monkeypatch):
+        store_dir = tmp_path / "nested" / "store"
+        monkeypatch.setattr(store, "STORE_DIR", store_dir)
+        monkeypatch.setattr(store, "CONFIG_PATH", store_dir / "config.json")
+        store._write_config({"a": 1})
+        assert store._read_config() == {"a": 1}
+
     def test_atomic_write(self, tmp_path):
         """Config write doesn't corrupt on overwrite."""
         store._write_config({"a": 1})
@@ -117,6 +174,13 @@ class TestBreakpoints:
         assert bp["note"] == "First breakpoint"
         assert "timestamp" in bp
 
+    def test_timestamp_is_utc_iso(self, project):
+        from datetime import datetime, timezone
+        bp = store.add_breakpoint(project, "ts")
+        parsed = datetime.fromisoformat(bp["timestamp"])
+        assert parsed.tzinfo == timezone.utc
+        assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 60
+
     def test_auto_incrementing_id(self, project):
         store.add_breakpoint(project, "one")
         bp2 = store.add_breakpoint(project, "two")
@@ -155,6 +219,21 @@ class TestBreakpoints:
     def test_get_previous_none_when_empty(self, project):
         assert store.get_previous_breakpoint(project) is None
 
+    def test_get_last_two_breakpoints(self, project):
+        store.add_breakpoint(project, "first")
+        store.add_breakpoint(project, "second")
+        store.add_breakpoint(project, "third")
+        current, previous = store.get_last_two_breakpoints(project)
+        assert current["note"] == "third"
+        assert previous["note"] == "second"
+
+    def test_get_last_two_breakpoints_partial(self, project):
+        assert store.get_last_two_breakpoints(project) == (None, None)
+        store.add_breakpoint(project, "only one")
+        current, previous = store.get_last_two_breakpoints(project)
+        assert current["note"] == "only one"
+        assert previous is None
+
     def test_get_all_breakpoints(self, project):
         store.add_breakpoint(project, "a")
         store.add_breakpoint(project, "b")
@@ -174,6 +253,11 @@ class TestBreakpoints:
         assert bp["id"] == 2
         assert bp["note"] == "second"
 
+    def test_get_breakpoint_by_id_returns_fresh_entry(self, project):
+        store.add_breakpoint(project, "first")
+        store.get_breakpoint_by_id(project, 1)["note"] = "changed"
+        assert store.get_all_breakpoints(project)[0]["note"] == "first"
+
     def test_get_breakpoint_by_id_first(self, project):
         store.add_breakpoint(project, "first")
         store.add_breakpoint(project, "second")
@@ -260,6 +344,18 @@ class TestReflections:
         assert loops[1]["reflection_id"] == 2
         assert loops[2]["loop"] == "F → G → H"
 
+    def test_get_reflections_returns_fresh_entries(self, project):
+        store.add_breakpoint(project, "bp")
+        store.store_reflection(project, "R1", loops=["A → B"])
+        store.get_reflections(project)[0]["loops"].append("X → Y")
+        assert [e["loop"] for e in store.get_all_loops(project)] == ["A → B"]
+
+    def test_get_all_loops_from_given_reflections(self, project):
+        store.add_breakpoint(project, "bp")
+        store.store_reflection(project, "R1", loops=["A → B"])
+        reflections = store.get_reflections(project)
+        assert store.get_all_loops(project, reflections) == store.get_all_loops(project)
+
     def test_get_all_loops_empty(self, project):
         assert store.get_all_loops(project) == []
 
@@ -397,6 +493,13 @@ class TestRecordingState:
         assert store.is_recording("project-a") is False
         assert store.is_recording("project-b") is True
 
+    def test_external_config_edit_invalidates(self, project):
+        store.enable_recording(project)
+        assert store.is_recording(project) is True
+        store.CONFIG_PATH.write_text(json.dumps(
+            {"projects": {project: {"enabled": False}}}))
+        assert store.is_recording(project) is False
+
     def test_config_missing_returns_false(self, project):
         """No config.json at all → not recording."""
         assert store.is_recording(project) is False
@@ -567,6 +670,21 @@ class TestCLI:
         assert len(data) == 1
         assert data[0]["breakpoint_id"] == 2
 
+    def test_cli_step_frequencies(self, monkeypatch, capsys, project):
+        store.store_reflection(project, "R1", loops=["A → B", "B → C"])
+        monkeypatch.setattr("sys.argv",
+                          ["confessional_store.py", "step_frequencies", project])
+        store.main()
+        data = json.loads(capsys.readouterr().out)
+        assert data[0] == {"step": "B", "count": 2}
+
+    def test_cli_core_loop_none(self, monkeypatch, capsys, project):
+        monkeypatch.setattr("sys.argv",
+                          ["confessional_store.py", "core_loop", project])
+        store.main()
+        data = json.loads(capsys.readouterr().out)
+        assert "error" in data
+
     def test_cli_unknown_command(self, monkeypatch, project):
         monkeypatch.setattr("sys.argv",
                           ["confessional_store.py", "bogus", project])
@@ -212,6 +212,16 @@ class TestTableHtml:
         assert "A" in html
 
 
+class TestPlural:
+
+    def test_singular(self):
+        assert dashboard._plural(1, "loop", "loops") == "1 loop"
+
+    def test_plural(self):
+        assert dashboard._plural(0, "loop", "loops") == "0 loops"
+        assert dashboard._plural(3, "loop", "loops") == "3 loops"
+
+
 class TestProgressBarHtml:
 
     def test_basic(self):
@@ -787,6 +787,45 @@ def compute_effectiveness_signals(turns):
     }
 
 
+def _cli_analyze(cwd, since):
+    return get_turns_since(cwd, since)
+
+
+def _cli_sessions(cwd, since):
+    result = []
+    for path in find_sessions(cwd):
+        parsed = parse_session(path)
+        result.append({
+            "session_id": parsed["session_id"],
+            "model": parsed["model"],
+            "version": parsed["version"],
+            "git_branch": parsed["git_branch"],
+            "turn_count": len(parsed["turns"]),
+            "path": str(path),
+        })
+    return result
+
+
+def _cli_stats(cwd, since):
+    result = get_turns_since(cwd, since)
+    return {
+        "turn_count": result["turn_count"],
+        "tool_stats": result["tool_stats"],
+        "token_stats": result["token_stats"],
+        "session_count": len(result["sessions"]),
+        "prompt_linguistics": result["prompt_linguistics"],
+        "effectiveness_signals": result["effectiveness_signals"],
+    }
+
+
+# command -> handler(cwd, since_timestamp)
+COMMANDS = {
+    "analyze": _cli_analyze,
+    "sessions": _cli_sessions,
+    "stats": _cli_stats,
+}
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: transcript_reader.py <command> <cwd> [since_timestamp]")
@@ -796,39 +835,15 @@ def main():
     command = sys.argv[1]
     cwd = sys.argv[2]
 
-    if command == "analyze":
-        since = sys.argv[3] if len(sys.argv) > 3 else ""
-        result = get_turns_since(cwd, since)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
-    elif command == "sessions":
-        sessions = find_sessions(cwd)
-        result = []
-        for path in sessions:
-            parsed = parse_session(path)
-            result.append({
-                "session_id": parsed["session_id"],
-                "model": parsed["model"],
-                "version": parsed["version"],
-                "git_branch": parsed["git_branch"],
-                "turn_count": len(parsed["turns"]),
-                "path": str(path),
-            })
-        print(json.dumps(result, indent=2, ensure_ascii=False))
-    elif command == "stats":
-        since = sys.argv[3] if len(sys.argv) > 3 else ""
-        result = get_turns_since(cwd, since)
-        print(json.dumps({
-            "turn_count": result["turn_count"],
-            "tool_stats": result["tool_stats"],
-            "token_stats": result["token_stats"],
-            "session_count": len(result["sessions"]),
-            "prompt_linguistics": result["prompt_linguistics"],
-            "effectiveness_signals": result["effectiveness_signals"],
-        }, indent=2, ensure_ascii=False))
-    else:
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
         sys.exit(1)
 
+    since = sys.argv[3] if len(sys.argv) > 3 else ""
+    result = handler(cwd, since)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
 
 if __name__ == "__main__":
     main()